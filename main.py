@@ -2,6 +2,8 @@ from datetime import datetime, timedelta
 from matplotlib.dates import relativedelta
 import numpy as np
 import os 
+from pathlib import Path
+import sqlite3
 from urllib.parse import urlencode
 import time
 import pandas as pd
@@ -558,9 +560,308 @@ def generate_month_ranges(start_date, end_date):
     return month_ranges
 
 
+# SQLite output store: parcels, owners and rental contacts, with an Excel-shaped view on top
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parcels (
+    parcel_id TEXT PRIMARY KEY,
+    evh_no TEXT,
+    property_address TEXT,
+    property_city TEXT,
+    property_state TEXT,
+    property_zip_code TEXT,
+    description TEXT,
+    mailing_address TEXT,
+    mailing_city TEXT,
+    mailing_state TEXT,
+    mailing_zip TEXT,
+    bedroom TEXT,
+    bathroom TEXT,
+    tot_fin_area TEXT,
+    year_built TEXT,
+    property_class TEXT,
+    transfer_date TEXT,
+    transfer_date_iso TEXT,
+    transfer_price TEXT
+);
+
+CREATE TABLE IF NOT EXISTS owners (
+    id INTEGER PRIMARY KEY,
+    parcel_id TEXT NOT NULL REFERENCES parcels(parcel_id),
+    full_name TEXT NOT NULL,
+    first_name TEXT,
+    last_name TEXT,
+    UNIQUE (parcel_id, full_name)
+);
+
+CREATE TABLE IF NOT EXISTS rental_contacts (
+    parcel_id TEXT PRIMARY KEY REFERENCES parcels(parcel_id),
+    owner_name TEXT,
+    owner_business TEXT,
+    title TEXT,
+    address_1 TEXT,
+    address_2 TEXT,
+    rental_city TEXT,
+    rental_state TEXT,
+    rental_zipcode TEXT,
+    phone TEXT,
+    email TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_owners_last_name ON owners(last_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_parcels_zip ON parcels(property_zip_code);
+CREATE INDEX IF NOT EXISTS idx_parcels_mailing_city ON parcels(mailing_city COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_parcels_property_class ON parcels(property_class);
+CREATE INDEX IF NOT EXISTS idx_parcels_transfer_date ON parcels(transfer_date_iso);
+
+DROP VIEW IF EXISTS output_view;
+CREATE VIEW output_view AS
+SELECT
+    p.evh_no AS "evh #",
+    p.parcel_id AS "parcel",
+    COALESCE(o.full_name, '') AS "full name",
+    COALESCE(o.first_name, '') AS "first_name",
+    COALESCE(o.last_name, '') AS "last_name",
+    p.property_address AS "property_address",
+    p.property_city AS "property_city",
+    p.property_state AS "property_state",
+    p.property_zip_code AS "property_zip_code",
+    p.description AS "description",
+    p.mailing_address AS "mailing_address",
+    p.mailing_city AS "mailing_city",
+    p.mailing_state AS "mailing_state",
+    p.mailing_zip AS "mailing_zip",
+    COALESCE(r.owner_name, '') AS "owner_name",
+    COALESCE(r.owner_business, '') AS "owner_business",
+    COALESCE(r.title, '') AS "title",
+    COALESCE(r.address_1, '') AS "address_1",
+    COALESCE(r.address_2, '') AS "address_2",
+    COALESCE(r.rental_city, '') AS "rental_city",
+    COALESCE(r.rental_state, '') AS "rental_state",
+    COALESCE(r.rental_zipcode, '') AS "rental_zipcode",
+    COALESCE(r.phone, '') AS "phone",
+    COALESCE(r.email, '') AS "email",
+    p.bedroom AS "bedroom",
+    p.bathroom AS "bathroom",
+    p.tot_fin_area AS "Tot Fin Area",
+    p.year_built AS "year built",
+    p.property_class AS "Property Class",
+    p.transfer_date AS "Transfer Date",
+    p.transfer_price AS "Transfer Price",
+    p.transfer_date_iso AS "transfer_date_iso"
+FROM parcels p
+LEFT JOIN owners o ON o.parcel_id = p.parcel_id
+LEFT JOIN rental_contacts r ON r.parcel_id = p.parcel_id
+ORDER BY p.rowid, o.id;
+"""
+
+SQLITE_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS owners_fts USING fts5(full_name, parcel_id UNINDEXED);
+CREATE VIRTUAL TABLE IF NOT EXISTS descriptions_fts USING fts5(description, parcel_id UNINDEXED);
+"""
+
+
+def to_iso_date(date_text):
+    # The auditor site shows transfer dates as MM/DD/YYYY; store ISO so ranges sort correctly
+    for fmt in ("%m/%d/%Y", "%Y-%m-%d", "%Y%m%d"):
+        try:
+            return datetime.strptime(date_text.strip(), fmt).strftime("%Y-%m-%d")
+        except (AttributeError, ValueError):
+            continue
+    return None
+
+
+def init_sqlite_store(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SQLITE_SCHEMA)
+    try:
+        conn.executescript(SQLITE_FTS_SCHEMA)
+    except sqlite3.OperationalError as e:
+        print(f"Full-text search not available in this SQLite build, falling back to LIKE: {e}")
+    return conn
+
+
+def has_fts(conn):
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'owners_fts'").fetchone()
+    return row is not None
+
+
+def save_to_sqlite(processed_data, db_path, batch_size=500):
+    """Write process_owner_data rows into the SQLite store in batched transactions.
+
+    Returns the parcel IDs that were saved.
+    """
+    conn = init_sqlite_store(db_path)
+    fts = has_fts(conn)
+
+    # Group the flat owner rows back into one entry per parcel
+    parcels = {}
+    for row in processed_data:
+        parcel_id = row.get('parcel', '')
+        if not parcel_id:
+            continue
+        entry = parcels.setdefault(parcel_id, {"row": row, "owners": []})
+        if row.get('full_name', '').strip():
+            entry["owners"].append(row)
+
+    parcel_ids = list(parcels)
+    try:
+        for start in range(0, len(parcel_ids), batch_size):
+            batch = parcel_ids[start:start + batch_size]
+            parcel_rows, owner_rows, rental_rows = [], [], []
+            for parcel_id in batch:
+                row = parcels[parcel_id]["row"]
+                parcel_rows.append((
+                    parcel_id, row.get('EVH No', ''), row.get('property_address', ''),
+                    row.get('property_city', ''), row.get('property_state', ''),
+                    row.get('property_zip_code', ''), row.get('description', ''),
+                    row.get('mailing_address', ''), row.get('mailing_city', ''),
+                    row.get('mailing_state', ''), row.get('mailing_zip', ''),
+                    row.get('bedroom', ''), row.get('bathroom', ''), row.get('Tot Fin Area', ''),
+                    row.get('year built', ''), row.get('Property Class', ''),
+                    row.get('Transfer Date', ''), to_iso_date(row.get('Transfer Date', '')),
+                    row.get('Transfer Price', '')
+                ))
+                rental_rows.append((
+                    parcel_id, row.get('owner_name', ''), row.get('owner_business', ''),
+                    row.get('title', ''), row.get('address_1', ''), row.get('address_2', ''),
+                    row.get('rental_city', ''), row.get('rental_state', ''),
+                    row.get('rental_zipcode', ''), row.get('phone', ''), row.get('email', '')
+                ))
+                seen_owners = set()
+                for owner in parcels[parcel_id]["owners"]:
+                    full_name = owner['full_name'].strip()
+                    if full_name in seen_owners:
+                        continue
+                    seen_owners.add(full_name)
+                    owner_rows.append((
+                        parcel_id, full_name,
+                        owner.get('first_name', ''), owner.get('last_name', '')
+                    ))
+
+            keys = [(parcel_id,) for parcel_id in batch]
+            with conn:
+                # Re-scraped parcels replace their previous owners and search entries
+                conn.executemany("DELETE FROM owners WHERE parcel_id = ?", keys)
+                conn.executemany("INSERT OR REPLACE INTO parcels VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", parcel_rows)
+                conn.executemany("INSERT OR REPLACE INTO rental_contacts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rental_rows)
+                conn.executemany(
+                    "INSERT INTO owners (parcel_id, full_name, first_name, last_name) VALUES (?, ?, ?, ?)",
+                    owner_rows
+                )
+                if fts:
+                    conn.executemany("DELETE FROM owners_fts WHERE parcel_id = ?", keys)
+                    conn.executemany("DELETE FROM descriptions_fts WHERE parcel_id = ?", keys)
+                    conn.executemany(
+                        "INSERT INTO owners_fts (full_name, parcel_id) VALUES (?, ?)",
+                        [(owner[1], owner[0]) for owner in owner_rows]
+                    )
+                    conn.executemany(
+                        "INSERT INTO descriptions_fts (description, parcel_id) VALUES (?, ?)",
+                        [(row[6], row[0]) for row in parcel_rows if row[6]]
+                    )
+            print(f"Saved parcels {start + 1}-{start + len(batch)} of {len(parcel_ids)} to {db_path}")
+    finally:
+        conn.close()
+
+    return parcel_ids
+
+
+def open_sqlite_store(db_path):
+    # Read-only, so a mistyped path fails instead of creating an empty database
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"SQLite database not found: {db_path}")
+    return sqlite3.connect(Path(db_path).resolve().as_uri() + "?mode=ro", uri=True)
+
+
+def word_match(text, fts, fts_table, table, column):
+    # Every word must match the start of a word in the column, via FTS5 prefix terms or an equivalent LIKE
+    words = text.split()
+    if fts:
+        match = " ".join('"' + word.replace('"', '""') + '"*' for word in words)
+        return f'"parcel" IN (SELECT parcel_id FROM {fts_table} WHERE {fts_table} MATCH ?)', [match]
+    likes, params = [], []
+    for word in words:
+        escaped = word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        likes.append(f"(' ' || {column}) LIKE ? ESCAPE '\\'")
+        params.append(f"% {escaped}%")
+    return f'"parcel" IN (SELECT parcel_id FROM {table} WHERE {" AND ".join(likes)})', params
+
+
+def query_date(date_text):
+    iso_date = to_iso_date(date_text)
+    if iso_date is None:
+        raise ValueError(f"Invalid date '{date_text}', expected YYYYMMDD")
+    return iso_date
+
+
+def query_sqlite_store(db_path, owner_name=None, last_name=None, description=None, zip_code=None,
+                       mailing_city=None, property_class=None, transfer_start=None, transfer_end=None):
+    """Look up rows of the output view. Dates use the same YYYYMMDD format as the script input.
+
+    owner_name and description match words by prefix ("smi" finds SMITH); last_name is an exact,
+    case-insensitive match. Owner filters return every owner row of the matching parcels.
+    """
+    conditions, params = [], []
+    if transfer_start or transfer_end:
+        conditions.append('"transfer_date_iso" BETWEEN ? AND ?')
+        params.append(query_date(transfer_start) if transfer_start else "0000-00-00")
+        params.append(query_date(transfer_end) if transfer_end else "9999-99-99")
+
+    conn = open_sqlite_store(db_path)
+    fts = has_fts(conn)
+    try:
+        if owner_name and owner_name.strip():
+            condition, owner_params = word_match(owner_name, fts, "owners_fts", "owners", "full_name")
+            conditions.append(condition)
+            params.extend(owner_params)
+        if last_name and last_name.strip():
+            conditions.append('"parcel" IN (SELECT parcel_id FROM owners WHERE last_name = ? COLLATE NOCASE)')
+            params.append(last_name.strip())
+        if description and description.strip():
+            condition, description_params = word_match(description, fts, "descriptions_fts", "parcels", "description")
+            conditions.append(condition)
+            params.extend(description_params)
+        if zip_code:
+            conditions.append('"property_zip_code" = ?')
+            params.append(zip_code)
+        if mailing_city:
+            conditions.append('"mailing_city" = ? COLLATE NOCASE')
+            params.append(mailing_city)
+        if property_class:
+            conditions.append('"Property Class" = ?')
+            params.append(property_class)
+
+        query = "SELECT * FROM output_view"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        df = pd.read_sql_query(query, conn, params=params)
+    finally:
+        conn.close()
+    return df.drop(columns=["transfer_date_iso"])
+
+
+def export_sqlite_to_excel(db_path, output_file, parcel_ids=None):
+    """Export the output view to Excel, limited to parcel_ids when given (e.g. the parcels of this run)."""
+    conn = open_sqlite_store(db_path)
+    try:
+        query = "SELECT * FROM output_view"
+        if parcel_ids is not None:
+            conn.execute("CREATE TEMP TABLE export_parcels (parcel_id TEXT PRIMARY KEY)")
+            conn.executemany("INSERT OR IGNORE INTO temp.export_parcels VALUES (?)", [(parcel_id,) for parcel_id in parcel_ids])
+            query += ' WHERE "parcel" IN (SELECT parcel_id FROM temp.export_parcels)'
+        df = pd.read_sql_query(query, conn)
+    finally:
+        conn.close()
+    df = df.drop(columns=["transfer_date_iso"])
+    df.to_excel(output_file, index=False)
+    return df
+
+
 if __name__ == "__main__":
     start_date = input("Enter the start date YYYYMMDD : \t")  # January 1, 2023
     end_date = input("Enter the End date YYYYMMDD : \t")  # January 1, 2023
+    sqlite_db = input("Enter the SQLite database path (leave blank to skip) : \t").strip()
 
     # Generate month ranges
     month_ranges = generate_month_ranges(start_date, end_date)
@@ -639,8 +940,6 @@ if __name__ == "__main__":
     processed_data = []  # List to hold processed data
     process_owner_data(all_data, split_full_name, processed_data)
 
-    # # Create a DataFrame
-    df = pd.DataFrame(processed_data, columns=columns)
     output_file = "Output.xlsx"
 
     renamed_file = 'Previous_output.xlsx'
@@ -660,5 +959,13 @@ if __name__ == "__main__":
         os.rename('ParcelIDFile_Complete.csv', 'ProcessedIDs.csv')
         print(f"File renamed to {renamed_file}")
 
-    df.to_excel(output_file, index=False)
-    print(f"Data saved to {output_file}")
+    if sqlite_db:
+        # Excel output is a view over the SQLite store
+        saved_parcel_ids = save_to_sqlite(processed_data, sqlite_db)
+        export_sqlite_to_excel(sqlite_db, output_file, saved_parcel_ids)
+        print(f"Data saved to {sqlite_db} and {output_file}")
+    else:
+        # # Create a DataFrame
+        df = pd.DataFrame(processed_data, columns=columns)
+        df.to_excel(output_file, index=False)
+        print(f"Data saved to {output_file}")
@@ -0,0 +1,123 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from main import export_sqlite_to_excel, init_sqlite_store, query_sqlite_store, save_to_sqlite
+
+
+def make_row(parcel, full_name='', first_name='', last_name='', **fields):
+    row = {
+        "parcel": parcel,
+        "full_name": full_name,
+        "first_name": first_name,
+        "last_name": last_name,
+        "property_zip_code": "43215",
+        "mailing_city": "COLUMBUS",
+        "description": "",
+        "Property Class": "510",
+        "Transfer Date": "",
+    }
+    row.update(fields)
+    return row
+
+
+ROWS = [
+    make_row("010-000001", "JOHN SMITH", "JOHN", "SMITH",
+             description="LOT 5 MAPLE GROVE ADDITION", **{"Transfer Date": "03/15/2021"}),
+    make_row("010-000001", "JANE SMITH", "JANE", "SMITH",
+             description="LOT 5 MAPLE GROVE ADDITION", **{"Transfer Date": "03/15/2021"}),
+    make_row("010-000002", "ACME INVESTMENTS LLC", "", "ACME INVESTMENTS LLC",
+             property_zip_code="43206", mailing_city="Dublin", description="OAK HILL SUB LOT 12",
+             **{"Property Class": "520", "Transfer Date": "11/02/2023"}),
+    make_row("010-000003"),
+]
+
+
+class SqliteStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "store.db")
+        save_to_sqlite(ROWS, self.db_path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def count(self, table):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        finally:
+            conn.close()
+
+    def parcels(self, **filters):
+        return sorted(set(query_sqlite_store(self.db_path, **filters)["parcel"]))
+
+    def test_saving_twice_does_not_duplicate_rows(self):
+        save_to_sqlite(ROWS, self.db_path, batch_size=1)
+        self.assertEqual(self.count("parcels"), 3)
+        self.assertEqual(self.count("owners"), 3)
+        self.assertEqual(self.count("rental_contacts"), 3)
+        self.assertEqual(self.count("owners_fts"), 3)
+        self.assertEqual(self.count("descriptions_fts"), 2)
+
+    def test_parcel_without_owners_is_in_view(self):
+        df = query_sqlite_store(self.db_path)
+        self.assertEqual(len(df), 4)
+        row = df[df["parcel"] == "010-000003"]
+        self.assertEqual(list(row["full name"]), [""])
+
+    def test_query_filters(self):
+        self.assertEqual(self.parcels(owner_name="smi"), ["010-000001"])
+        self.assertEqual(self.parcels(owner_name="jane smith"), ["010-000001"])
+        self.assertEqual(self.parcels(owner_name="mith"), [])
+        self.assertEqual(self.parcels(owner_name="  "), ["010-000001", "010-000002", "010-000003"])
+        self.assertEqual(self.parcels(last_name="smith"), ["010-000001"])
+        self.assertEqual(self.parcels(description="oak hill"), ["010-000002"])
+        self.assertEqual(self.parcels(zip_code="43206"), ["010-000002"])
+        self.assertEqual(self.parcels(mailing_city="dublin"), ["010-000002"])
+        self.assertEqual(self.parcels(property_class="510"), ["010-000001", "010-000003"])
+        self.assertEqual(self.parcels(transfer_start="20230101", transfer_end="20231231"), ["010-000002"])
+        self.assertEqual(self.parcels(transfer_end="20221231"), ["010-000001"])
+
+    def test_like_fallback_matches_fts(self):
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            conn.execute("DROP TABLE owners_fts")
+            conn.execute("DROP TABLE descriptions_fts")
+        conn.close()
+        self.assertEqual(self.parcels(owner_name="smi"), ["010-000001"])
+        self.assertEqual(self.parcels(owner_name="mith"), [])
+        self.assertEqual(self.parcels(description="oak hill"), ["010-000002"])
+
+    def test_invalid_transfer_date_raises(self):
+        with self.assertRaises(ValueError):
+            query_sqlite_store(self.db_path, transfer_start="2023/01/01")
+
+    def test_missing_database_raises(self):
+        missing = os.path.join(self.tmpdir.name, "missing.db")
+        with self.assertRaises(FileNotFoundError):
+            query_sqlite_store(missing)
+        self.assertFalse(os.path.exists(missing))
+
+    def test_export_limited_to_parcel_ids(self):
+        output_file = os.path.join(self.tmpdir.name, "Output.xlsx")
+        df = export_sqlite_to_excel(self.db_path, output_file, ["010-000002"])
+        self.assertEqual(list(df["parcel"]), ["010-000002"])
+        self.assertNotIn("transfer_date_iso", df.columns)
+        self.assertTrue(os.path.exists(output_file))
+
+    def test_filters_use_indexes(self):
+        conn = init_sqlite_store(self.db_path)
+        try:
+            for where in ('"property_zip_code" = ?', '"mailing_city" = ? COLLATE NOCASE',
+                          '"Property Class" = ?', '"transfer_date_iso" BETWEEN ? AND ?'):
+                plan = conn.execute(f"EXPLAIN QUERY PLAN SELECT * FROM output_view WHERE {where}",
+                                    ["x"] * where.count("?")).fetchall()
+                self.assertIn("USING INDEX idx_parcels_", " ".join(step[-1] for step in plan), where)
+        finally:
+            conn.close()
+
+
+if __name__ == "__main__":
+    unittest.main()